@@ -231,6 +231,12 @@ async def check_signals_from_sheets():
                 'timestamp': datetime.now().isoformat()
             })
         }
+    finally:
+        # Выходим из aioboto3-контекста до заморозки окружения:
+        # его соединения не должны висеть через freeze, а ресурс
+        # лениво пересоздастся на следующем инвоке
+        if storage is not None:
+            await storage.close()
 
 
 def lambda_handler(event, context):
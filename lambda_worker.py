@@ -196,6 +196,12 @@ async def process_signal(signal_dict: dict):
     except Exception as e:
         logger.error(f"❌ Error processing signal: {e}", exc_info=True)
         return False
+    finally:
+        # Выходим из aioboto3-контекста до заморозки окружения:
+        # его соединения не должны висеть через freeze, а ресурс
+        # лениво пересоздастся на следующем инвоке
+        if storage is not None:
+            await storage.close()
 
 
 def lambda_handler(event, context):
@@ -1,9 +1,10 @@
 """
 Price-related data models
 """
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from models.signal import ExchangeType
 
 
@@ -12,7 +13,22 @@ class PriceData(BaseModel):
     exchange: ExchangeType
     symbol: str = Field(..., pattern=r'^[A-Z]{3,10}[A-Z]{3,5}$')
     price: float = Field(..., gt=0)
-    timestamp: datetime = Field(default_factory=datetime.now)
+    # Epoch-секунды вместо datetime: time.time() не создает объект datetime
+    # на каждый тик цены (заметно на тысячах PriceData за цикл проверки)
+    timestamp: float = Field(default_factory=time.time)
+
+    @field_validator('timestamp', mode='before')
+    @classmethod
+    def _coerce_timestamp(cls, v):
+        """Принимает и datetime (legacy-код), и epoch-секунды"""
+        if isinstance(v, datetime):
+            return v.timestamp()
+        return v
+
+    @property
+    def timestamp_dt(self) -> datetime:
+        """datetime-представление timestamp для отображения"""
+        return datetime.fromtimestamp(self.timestamp)
     
     # Additional market data
     volume_24h: Optional[float] = Field(None, ge=0)
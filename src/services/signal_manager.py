@@ -4,6 +4,9 @@ import asyncio
 import logging
 from collections import defaultdict
 from datetime import datetime, timezone
+from typing import List
+
+import numpy as np
 
 # --- Импорты ваших моделей и сервисов ---
 from models.signal import SignalTarget, SignalResult, SignalCondition
@@ -13,6 +16,21 @@ from storage.base import StorageBase
 
 logger = logging.getLogger(__name__)
 
+# Числовые коды условий для векторизованной проверки через NumPy
+_CONDITION_CODES = {
+    SignalCondition.ABOVE: 0,
+    SignalCondition.BELOW: 1,
+    SignalCondition.EQUAL: 2,
+}
+
+# Ниже этого количества сигналов обычный Python-цикл быстрее,
+# чем накладные расходы на создание NumPy массивов
+_VECTORIZE_MIN_SIGNALS = 100
+
+# Ограничение параллельных отправок/записей, чтобы не упереться
+# в rate limit Pushover и DynamoDB
+_MAX_CONCURRENT_DISPATCH = 5
+
 class SignalManager:
     """
     Главный сервис, который управляет жизненным циклом сигналов:
@@ -32,6 +50,47 @@ class SignalManager:
         self.notification_service = notification_service
         self.storage = storage_service
 
+    @staticmethod
+    def _evaluate_conditions(
+        signals: List[SignalTarget],
+        prices: List[float]
+    ) -> List[bool]:
+        """
+        Проверяет условия срабатывания для списка сигналов.
+
+        Для больших списков использует векторизованный NumPy-путь:
+        условия кодируются числами, и все сравнения выполняются
+        одним проходом на уровне C вместо цикла по Python-объектам.
+        """
+        n = len(signals)
+        if n < _VECTORIZE_MIN_SIGNALS:
+            # Обычный путь для небольших списков
+            flags = []
+            for signal, price in zip(signals, prices):
+                triggered = False
+                if signal.condition == SignalCondition.ABOVE and price > signal.target_price:
+                    triggered = True
+                elif signal.condition == SignalCondition.BELOW and price < signal.target_price:
+                    triggered = True
+                elif signal.condition == SignalCondition.EQUAL and price == signal.target_price:
+                    triggered = True
+                flags.append(triggered)
+            return flags
+
+        # Векторизованный путь: SoA массивы + одно сравнение на условие
+        price_arr = np.fromiter(prices, dtype=np.float64, count=n)
+        target_arr = np.fromiter((s.target_price for s in signals), dtype=np.float64, count=n)
+        cond_arr = np.fromiter(
+            (_CONDITION_CODES.get(s.condition, -1) for s in signals),
+            dtype=np.int8, count=n
+        )
+        triggered_mask = (
+            ((cond_arr == 0) & (price_arr > target_arr))
+            | ((cond_arr == 1) & (price_arr < target_arr))
+            | ((cond_arr == 2) & (price_arr == target_arr))
+        )
+        return triggered_mask.tolist()
+
     async def check_all_signals(self):
         """
         Основной метод для выполнения одного цикла проверки всех сигналов.
@@ -84,7 +143,10 @@ class SignalManager:
         # 4. Проверяем условия для каждого сигнала
         all_results = []  # ВСЕ результаты (для CSV)
         triggered_results = []  # Только сработавшие (для notifications)
-        
+
+        # Отбираем сигналы, для которых удалось получить цену
+        checked_signals = []
+        checked_prices = []
         for signal in active_signals:
             price_key = (signal.exchange, signal.symbol)
             current_price = current_prices.get(price_key)
@@ -93,14 +155,12 @@ class SignalManager:
                 logger.warning(f"Could not get price for {signal.symbol} on {signal.exchange}. Skipping signal '{signal.name}'.")
                 continue
 
-            triggered = False
-            if signal.condition == SignalCondition.ABOVE and current_price > signal.target_price:
-                triggered = True
-            elif signal.condition == SignalCondition.BELOW and current_price < signal.target_price:
-                triggered = True
-            elif signal.condition == SignalCondition.EQUAL and current_price == signal.target_price:
-                triggered = True
-            
+            checked_signals.append(signal)
+            checked_prices.append(current_price)
+
+        triggered_flags = self._evaluate_conditions(checked_signals, checked_prices)
+
+        for signal, current_price, triggered in zip(checked_signals, checked_prices, triggered_flags):
             # Создаем результат (вне зависимости от triggered)
             result = SignalResult(
                 signal=signal,
@@ -108,7 +168,7 @@ class SignalManager:
                 triggered=triggered
             )
             all_results.append(result)
-            
+
             if triggered:
                 logger.info(f"Signal '{signal.name}' triggered for {signal.symbol} at price {current_price}")
                 triggered_results.append(result)
@@ -118,13 +178,19 @@ class SignalManager:
             logger.info("Signal check cycle completed. No signals were triggered.")
             return all_results  # Возвращаем все результаты
 
-        # Асинхронно отправляем все уведомления
+        # Асинхронно отправляем все уведомления (параллельно, но с лимитом)
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_DISPATCH)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
         notification_tasks = [
-            self.notification_service.send_alert_notification(result)
+            _bounded(self.notification_service.send_alert_notification(result))
             for result in triggered_results
         ]
         await asyncio.gather(*notification_tasks, return_exceptions=True)
-        
+
         # Асинхронно обновляем сигналы в базе данных
         update_tasks = []
         for result in triggered_results:
@@ -133,9 +199,9 @@ class SignalManager:
             signal_to_update.last_triggered_at = datetime.now(timezone.utc)
             # ВАРИАНТ 1: Один раз НАВСЕГДА - деактивируем после первого срабатывания
             signal_to_update.active = False
-            
-            update_tasks.append(self.storage.update_signal(signal_to_update))
-            
+
+            update_tasks.append(_bounded(self.storage.update_signal(signal_to_update)))
+
         await asyncio.gather(*update_tasks, return_exceptions=True)
         
         logger.info(f"Signal check cycle completed. {len(triggered_results)} signals were triggered and processed.")
@@ -6,6 +6,7 @@ import os
 import json
 import logging
 import asyncio
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
@@ -13,12 +14,52 @@ from decimal import Decimal
 import boto3
 from botocore.exceptions import ClientError
 
+# aioboto3 опционален: если установлен - используем нативный async клиент,
+# иначе fallback на boto3 + asyncio.to_thread
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
 from models.signal import SignalTarget
 from storage.base import StorageBase
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _static_item_part(
+    signal_id: str,
+    name: str,
+    exchange_value: str,
+    symbol: str,
+    condition_value: str,
+    user_id: Optional[str],
+    notes: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Неизменяемая часть DynamoDB item для сигнала.
+
+    Эти поля практически не меняются между сохранениями одного сигнала,
+    поэтому словарь кешируется (важно на bulk-импортах).
+    """
+    item = {
+        'PK': f"signal#{signal_id}",
+        'SK': 'metadata',
+        'entity_type': 'signal',
+        'signal_id': signal_id,
+        'name': name,
+        'exchange': exchange_value,
+        'symbol': symbol,
+        'condition': condition_value,
+    }
+    if user_id:
+        item['user_id'] = user_id
+    if notes:
+        item['notes'] = notes
+    return item
+
+
 class DynamoDBStorage(StorageBase):
     """
     DynamoDB storage для сигналов и пользовательских данных
@@ -43,8 +84,43 @@ class DynamoDBStorage(StorageBase):
         # Инициализируем DynamoDB client
         self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
         self.table = self.dynamodb.Table(table_name)
-        
-        logger.info(f"DynamoDB storage initialized: {table_name} in {self.region}")
+
+        # Нативный async клиент (aioboto3), инициализируется лениво
+        self._aio_session = aioboto3.Session() if aioboto3 else None
+        self._aio_resource_cm = None
+        self._aio_table = None
+
+        mode = "aioboto3 (native async)" if self._aio_session else "boto3 + to_thread"
+        logger.info(f"DynamoDB storage initialized: {table_name} in {self.region} [{mode}]")
+
+    async def _get_aio_table(self):
+        """Лениво создает aioboto3 Table (один раз на время жизни storage)"""
+        if self._aio_table is None:
+            self._aio_resource_cm = self._aio_session.resource(
+                'dynamodb', region_name=self.region
+            )
+            resource = await self._aio_resource_cm.__aenter__()
+            self._aio_table = await resource.Table(self.table_name)
+        return self._aio_table
+
+    async def _dynamo_call(self, method: str, **kwargs):
+        """
+        Выполняет операцию над таблицей DynamoDB асинхронно.
+
+        С aioboto3 это настоящий async I/O без блокировки потоков;
+        без него - синхронный boto3, вынесенный в thread pool.
+        """
+        if self._aio_session is not None:
+            table = await self._get_aio_table()
+            return await getattr(table, method)(**kwargs)
+        return await asyncio.to_thread(getattr(self.table, method), **kwargs)
+
+    async def close(self):
+        """Закрывает aioboto3 ресурс (если использовался)"""
+        if self._aio_resource_cm is not None:
+            await self._aio_resource_cm.__aexit__(None, None, None)
+            self._aio_resource_cm = None
+            self._aio_table = None
     
     def _signal_to_item(self, signal: SignalTarget) -> Dict[str, Any]:
         """
@@ -52,22 +128,27 @@ class DynamoDBStorage(StorageBase):
         
         DynamoDB не поддерживает float, используем Decimal
         """
+        # Статическая часть кешируется по неизменяемым полям сигнала
+        static = _static_item_part(
+            signal.id or signal.name,
+            signal.name,
+            signal.exchange.value,
+            signal.symbol,
+            signal.condition.value,
+            signal.user_id,
+            signal.notes,
+        )
+
+        # Динамическая часть пересчитывается на каждое сохранение
         item = {
-            'PK': f"signal#{signal.id or signal.name}",
-            'SK': 'metadata',
-            'entity_type': 'signal',
-            'signal_id': signal.id or signal.name,
-            'name': signal.name,
-            'exchange': signal.exchange.value,
-            'symbol': signal.symbol,
-            'condition': signal.condition.value,
+            **static,
             'target_price': Decimal(str(signal.target_price)),  # float -> Decimal
             'active': signal.active,
             'triggered_count': signal.triggered_count,
             'created_at': signal.created_at.isoformat(),
             'updated_at': signal.updated_at.isoformat(),
         }
-        
+
         # Optional fields
         if signal.percentage_threshold:
             item['percentage_threshold'] = Decimal(str(signal.percentage_threshold))
@@ -75,22 +156,22 @@ class DynamoDBStorage(StorageBase):
             item['max_triggers'] = signal.max_triggers
         if signal.last_triggered_at:
             item['last_triggered_at'] = signal.last_triggered_at.isoformat()
-        if signal.user_id:
-            item['user_id'] = signal.user_id
-        if signal.notes:
-            item['notes'] = signal.notes
-        
+
         return item
     
     def _item_to_signal(self, item: Dict[str, Any]) -> SignalTarget:
         """
         Конвертирует DynamoDB item в SignalTarget
-        
+
         Decimal -> float для target_price
+
+        Используем model_construct (без повторной pydantic-валидации):
+        данные из DynamoDB уже прошли валидацию при сохранении,
+        а на 10k+ сигналов валидация доминирует во времени загрузки.
         """
         from models.signal import ExchangeType, SignalCondition
-        
-        return SignalTarget(
+
+        return SignalTarget.model_construct(
             id=item['signal_id'],
             name=item['name'],
             exchange=ExchangeType(item['exchange']),
@@ -98,9 +179,11 @@ class DynamoDBStorage(StorageBase):
             condition=SignalCondition(item['condition']),
             target_price=float(item['target_price']),  # Decimal -> float
             active=item.get('active', True),
-            triggered_count=item.get('triggered_count', 0),
+            # Числа из DynamoDB приходят как Decimal; model_construct не
+            # коэрсит типы, поэтому приводим к int руками
+            triggered_count=int(item.get('triggered_count', 0)),
             percentage_threshold=float(item['percentage_threshold']) if item.get('percentage_threshold') else None,
-            max_triggers=item.get('max_triggers'),
+            max_triggers=int(item['max_triggers']) if item.get('max_triggers') is not None else None,
             created_at=datetime.fromisoformat(item['created_at']),
             updated_at=datetime.fromisoformat(item['updated_at']),
             last_triggered_at=datetime.fromisoformat(item['last_triggered_at']) if item.get('last_triggered_at') else None,
@@ -127,8 +210,8 @@ class DynamoDBStorage(StorageBase):
             # Проверяем существует ли уже этот сигнал
             pk = f"signal#{signal.id}"
             try:
-                response = await asyncio.to_thread(
-                    self.table.get_item,
+                response = await self._dynamo_call(
+                    'get_item',
                     Key={'PK': pk, 'SK': 'metadata'}
                 )
                 existing_item = response.get('Item')
@@ -148,7 +231,7 @@ class DynamoDBStorage(StorageBase):
             
             # Сохраняем (перезапись или создание)
             item = self._signal_to_item(signal)
-            await asyncio.to_thread(self.table.put_item, Item=item)
+            await self._dynamo_call('put_item', Item=item)
             logger.info(f"✅ Saved signal: {signal.name} (ID: {signal.id})")
             return True
             
@@ -168,8 +251,8 @@ class DynamoDBStorage(StorageBase):
             # Пробуем использовать Query с GSI (если индекс существует)
             try:
                 # ✅ Настоящий async
-                response = await asyncio.to_thread(
-                    self.table.query,
+                response = await self._dynamo_call(
+                    'query',
                     IndexName='entity_type-index',
                     KeyConditionExpression='entity_type = :type',
                     ExpressionAttributeValues={':type': 'signal'}
@@ -180,8 +263,8 @@ class DynamoDBStorage(StorageBase):
                 if 'ResourceNotFoundException' in str(e):
                     logger.warning("GSI 'entity_type-index' not found, using Scan (slower)")
                     # ✅ Настоящий async
-                    response = await asyncio.to_thread(
-                        self.table.scan,
+                    response = await self._dynamo_call(
+                        'scan',
                         FilterExpression='entity_type = :type',
                         ExpressionAttributeValues={':type': 'signal'}
                     )
@@ -211,8 +294,8 @@ class DynamoDBStorage(StorageBase):
         """
         try:
             # ✅ Настоящий async
-            await asyncio.to_thread(
-                self.table.delete_item,
+            await self._dynamo_call(
+                'delete_item',
                 Key={
                     'PK': f"signal#{signal_id}",
                     'SK': 'metadata'
@@ -244,8 +327,8 @@ class DynamoDBStorage(StorageBase):
         """
         try:
             # ✅ Настоящий async
-            response = await asyncio.to_thread(
-                self.table.get_item,
+            response = await self._dynamo_call(
+                'get_item',
                 Key={
                     'PK': f"user#{user_id}",
                     'SK': 'metadata'
@@ -292,7 +375,7 @@ class DynamoDBStorage(StorageBase):
             }
             
             # ✅ Настоящий async
-            await asyncio.to_thread(self.table.put_item, Item=item)
+            await self._dynamo_call('put_item', Item=item)
             logger.debug(f"Saved user data: {user_id}")
             return True
             
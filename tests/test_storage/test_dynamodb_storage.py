@@ -66,8 +66,12 @@ def dynamodb_table(aws_credentials, mock_dynamodb):
 
 
 @pytest.fixture
-def storage(dynamodb_table):
+def storage(dynamodb_table, monkeypatch):
     """Создает DynamoDBStorage с мок-таблицей"""
+    # Принудительно выключаем aioboto3-путь: moto перехватывает только
+    # boto3, и в окружении с установленным aioboto3 запросы ушли бы
+    # мимо mock_aws в aiobotocore
+    monkeypatch.setattr('storage.dynamodb_storage.aioboto3', None)
     return DynamoDBStorage(table_name='trading-signals', region='us-east-1')
 
 
@@ -211,4 +215,84 @@ async def test_decimal_conversion(storage, sample_signal):
     
     # Проверяем что цена осталась float (не Decimal)
     assert isinstance(signals[0].target_price, float)
-    assert signals[0].target_price == 99999.99
\ No newline at end of file
+    assert signals[0].target_price == 99999.99
+
+@pytest.mark.asyncio
+async def test_serialization_cache_hit(storage, sample_signal):
+    """Тест: статическая часть item кешируется между сохранениями"""
+    from storage.dynamodb_storage import _static_item_part
+
+    _static_item_part.cache_clear()
+
+    # Первое сохранение - промах кеша
+    await storage.save_signal(sample_signal)
+    info_after_first = _static_item_part.cache_info()
+    assert info_after_first.misses >= 1
+
+    # Повторное сохранение того же сигнала - попадание в кеш
+    sample_signal.target_price = 123456.0  # Динамическое поле меняется
+    await storage.save_signal(sample_signal)
+    info_after_second = _static_item_part.cache_info()
+    assert info_after_second.hits > info_after_first.hits
+
+    # Данные при этом сериализуются корректно
+    signals = await storage.load_signals()
+    assert signals[0].target_price == 123456.0
+
+
+@pytest.mark.asyncio
+async def test_load_signals_construct_fast(storage, dynamodb_table):
+    """Тест: быстрая загрузка большого количества сигналов через model_construct"""
+    # Загружаем 500 item'ов напрямую через batch_writer
+    with dynamodb_table.batch_writer() as batch:
+        for i in range(500):
+            batch.put_item(Item={
+                'PK': f'signal#bulk-{i}',
+                'SK': 'metadata',
+                'entity_type': 'signal',
+                'signal_id': f'bulk-{i}',
+                'name': f'Bulk Signal {i}',
+                'exchange': 'binance',
+                'symbol': 'BTCUSDT',
+                'condition': 'above',
+                'target_price': Decimal(str(100000 + i)),
+                'active': True,
+                'triggered_count': Decimal('3'),
+                'max_triggers': Decimal('5'),
+                'created_at': datetime.now().isoformat(),
+                'updated_at': datetime.now().isoformat(),
+                'user_id': 'bulk-user',
+            })
+
+    signals = await storage.load_signals()
+
+    assert len(signals) == 500
+
+    # Поля корректно сконвертированы несмотря на пропуск валидации:
+    # model_construct не коэрсит Decimal из DynamoDB сам
+    sample = next(s for s in signals if s.id == 'bulk-42')
+    assert isinstance(sample.target_price, float)
+    assert sample.target_price == 100042.0
+    assert isinstance(sample.triggered_count, int)
+    assert sample.triggered_count == 3
+    assert isinstance(sample.max_triggers, int)
+    assert sample.max_triggers == 5
+    assert sample.exchange == ExchangeType.BINANCE
+    assert sample.condition == SignalCondition.ABOVE
+    assert isinstance(sample.created_at, datetime)
+
+    # Результат без потерь сериализуется в JSON (Decimal бы здесь упал)
+    import json
+    json.dumps(sample.model_dump(mode='json'))
+
+
+def test_validation_still_enforced_on_write_path():
+    """Тест: на write path (прямое создание) валидация осталась строгой"""
+    with pytest.raises(Exception):
+        SignalTarget(
+            name='Bad Signal',
+            exchange=ExchangeType.BINANCE,
+            symbol='btcusdt',  # Нижний регистр - невалидный символ
+            condition=SignalCondition.ABOVE,
+            target_price=100.0,
+        )
@@ -10,18 +10,84 @@ import logging
 # Добавляем текущую директорию в path для импортов
 sys.path.insert(0, os.path.dirname(__file__))
 
-from services.alert_manager import AlertManager
-from services.price_checker import PriceChecker
-from services.notification import NotificationService
-from storage.json_storage import JSONStorage
-from exchange_adapters.factory import create_exchange_adapters
-from utils.config import load_config
+# Тяжелые импорты (ccxt, pybit, pydantic-модели) отложены до _init():
+# на module top остаются только stdlib-модули, чтобы snapshot/анализ
+# кода не тянул весь стек зависимостей. Сами импорты все равно
+# выполняются во время cold-start init (см. вызов _init() внизу),
+# поэтому первый инвок их не оплачивает.
 from utils.logger import setup_logging
 
 # Инициализация логирования
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# --- Синглтоны уровня модуля ---
+# Создаются один раз на microVM: warm-инвокации переиспользуют
+# конфиг, storage, подключения к биржам и event loop вместо того,
+# чтобы пересоздавать их на каждый вызов.
+_config = None
+_storage = None
+_exchange_adapters = None
+_price_checker = None
+_notification_service = None
+_alert_manager = None
+_loop = None
+
+
+async def _create_alert_manager():
+    """Создает все зависимости и собирает AlertManager (один раз)."""
+    global _config, _storage, _exchange_adapters, _price_checker, _notification_service
+
+    # Ленивая загрузка тяжелых модулей - выполняется один раз на cold start
+    from services.alert_manager import AlertManager
+    from services.price_checker import PriceChecker
+    from services.notification import NotificationService
+    from storage.json_storage import JSONStorage
+    from exchange_adapters.factory import create_exchange_adapters
+    from utils.config import load_config
+
+    # 1. Загружаем конфигурацию из переменных окружения
+    _config = load_config()
+    logger.info("Configuration loaded from environment variables")
+
+    # 2. Создаем все зависимости
+    # В Lambda используем /tmp для временных файлов
+    storage_path = f"/tmp/{_config.app.json_file_path}"
+    _storage = JSONStorage(storage_path)
+
+    _exchange_adapters = await create_exchange_adapters(_config.exchanges)
+    logger.info(f"Connected to {len(_exchange_adapters)} exchanges")
+
+    _price_checker = PriceChecker(_exchange_adapters)
+    _notification_service = NotificationService(_config.notifications, storage=_storage)
+    await _notification_service.initialize()
+
+    # 3. Создаем AlertManager
+    return AlertManager(
+        price_checker=_price_checker,
+        notification_service=_notification_service,
+        storage_service=_storage,
+        max_concurrency=_config.app.max_concurrent_checks
+    )
+
+
+def _init():
+    """
+    Одноразовая тяжелая инициализация (cold start).
+    Повторные вызовы ничего не делают.
+    """
+    global _alert_manager, _loop
+    if _alert_manager is not None:
+        return
+
+    logger.info("Cold start: initializing alert manager...")
+    # Кешируем свой event loop вместо asyncio.get_event_loop()
+    # (deprecated вне running loop + лишнее создание на каждый вызов)
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _alert_manager = _loop.run_until_complete(_create_alert_manager())
+    logger.info("Cold start initialization completed")
+
 
 async def check_alerts_once():
     """
@@ -30,40 +96,23 @@ async def check_alerts_once():
     """
     try:
         logger.info("Lambda function started - checking alerts...")
-        
-        # 1. Загружаем конфигурацию из переменных окружения
-        config = load_config()
-        logger.info("Configuration loaded from environment variables")
-        
-        # 2. Создаем все зависимости
-        # В Lambda используем /tmp для временных файлов
-        storage_path = f"/tmp/{config.app.json_file_path}"
-        storage = JSONStorage(storage_path)
-        
-        exchange_adapters = await create_exchange_adapters(config.exchanges)
-        logger.info(f"Connected to {len(exchange_adapters)} exchanges")
-        
-        price_checker = PriceChecker(exchange_adapters)
-        notification_service = NotificationService(config.notifications, storage=storage)
-        await notification_service.initialize()
-        
-        # 3. Создаем AlertManager
-        alert_manager = AlertManager(
-            price_checker=price_checker,
-            notification_service=notification_service,
-            storage_service=storage
-        )
-        
-        # 4. Проверяем все алерты ОДИН РАЗ
-        await alert_manager.check_all_alerts()
-        
+
+        # Все зависимости уже инициализированы на cold start
+        await _alert_manager.check_all_alerts()
+
+        # Pushover-отправки уходят через фоновую очередь; Lambda
+        # замораживает окружение сразу после return, поэтому дожидаемся
+        # очереди здесь - иначе emergency-уведомления зависнут до
+        # следующего инвока или потеряются при teardown
+        await _notification_service.drain()
+
         logger.info("Alert check completed successfully")
-        
+
         return {
             'statusCode': 200,
             'body': 'Alert check completed successfully'
         }
-        
+
     except Exception as e:
         logger.error(f"Error in Lambda function: {e}", exc_info=True)
         return {
@@ -75,18 +124,28 @@ async def check_alerts_once():
 def lambda_handler(event, context):
     """
     AWS Lambda entry point.
-    
+
     Args:
         event: EventBridge/CloudWatch event (не используется)
         context: Lambda context
-    
+
     Returns:
         dict: Response with statusCode and body
     """
     logger.info(f"Lambda invoked. Request ID: {context.request_id}")
-    
-    # Запускаем асинхронную проверку
-    loop = asyncio.get_event_loop()
-    result = loop.run_until_complete(check_alerts_once())
-    
-    return result
+
+    # На случай, если cold-start инициализация не удалась - пробуем еще раз
+    _init()
+
+    # Запускаем асинхронную проверку на кешированном event loop
+    return _loop.run_until_complete(check_alerts_once())
+
+
+# Вся тяжелая инициализация (импорты, подключения, warm-up) выполняется
+# при импорте модуля - Lambda оплачивает ее как cold-start init,
+# а не как время первого инвока
+try:
+    _init()
+except Exception as e:
+    # Не роняем импорт модуля: lambda_handler попробует еще раз
+    logger.error(f"Initialization at import time failed: {e}", exc_info=True)
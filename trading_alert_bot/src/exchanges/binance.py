@@ -1,19 +1,63 @@
 """Binance exchange adapter using ccxt library."""
 import logging
+import os
+import pickle
+import time
+from datetime import datetime
 from typing import List, Optional
 import ccxt.async_support as ccxt
 
 from exchanges.base import ExchangeBase
 from models.price import PriceData
 from models.alert import ExchangeType
+from utils.http import get_shared_session
 
 logger = logging.getLogger(__name__)
 
+# Кеш рынков в /tmp: переживает warm-инвокации Lambda на той же microVM
+# и экономит ~200-500ms load_markets() на каждом cold start
+_MARKETS_CACHE_PATH = "/tmp/binance_markets.pkl"
+_MARKETS_CACHE_TTL = 86400  # рынки меняются редко, суток достаточно
+
+# In-memory TTL кеш цен: несколько алертов на один символ в одном
+# цикле проверки не должны давать несколько HTTP-запросов
+_PRICE_CACHE_TTL = 2.0
+
+
 class BinanceExchange(ExchangeBase):
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, testnet: bool = False):
+        super().__init__(api_key, api_secret, testnet)
+        # Кеш цен и карты символов существуют с момента создания объекта:
+        # get_price/is_symbol_valid при неудавшемся connect() вернут
+        # None/False, а не упадут с AttributeError
+        self._price_cache = {}
+        self._symbol_to_ccxt = {}
+        self._ccxt_to_symbol = {}
+
     @property
     def exchange_type(self) -> ExchangeType:
         return ExchangeType.BINANCE
 
+    def _load_cached_markets(self):
+        """Читает рынки из /tmp кеша, если он свежий. Иначе None."""
+        try:
+            if os.path.exists(_MARKETS_CACHE_PATH):
+                with open(_MARKETS_CACHE_PATH, 'rb') as f:
+                    cached = pickle.load(f)
+                if time.time() - cached['ts'] < _MARKETS_CACHE_TTL:
+                    return cached['data']
+        except Exception as e:
+            logger.warning(f"Could not read markets cache: {e}")
+        return None
+
+    def _save_markets_cache(self, markets):
+        """Сохраняет рынки в /tmp кеш (best effort)."""
+        try:
+            with open(_MARKETS_CACHE_PATH, 'wb') as f:
+                pickle.dump({'ts': time.time(), 'data': markets}, f)
+        except Exception as e:
+            logger.warning(f"Could not write markets cache: {e}")
+
     async def connect(self) -> bool:
         """Initializes the ccxt Binance client."""
         try:
@@ -23,12 +67,39 @@ class BinanceExchange(ExchangeBase):
                 'options': {
                     'defaultType': 'spot',
                 },
+                # Общий keep-alive пул вместо отдельной сессии ccxt
+                'session': get_shared_session(),
             })
             if self.testnet:
                 self._client.set_sandbox_mode(True)
-            
-            # Test connection by fetching markets
-            await self._client.load_markets()
+
+            # Markets загружаем из /tmp кеша, если он свежий;
+            # иначе тянем с биржи и кешируем
+            cached_markets = self._load_cached_markets()
+            if cached_markets is not None:
+                self._client.set_markets(cached_markets)
+                logger.info("Binance markets loaded from /tmp cache")
+            else:
+                await self._client.load_markets()
+                self._save_markets_cache(self._client.markets)
+
+            # Карты символов BTCUSDT <-> BTC/USDT строим один раз из markets:
+            # срезы вида s[:-4] неверны для BTC/USD, ETH/BTC и т.п.,
+            # а dict-поиск еще и дешевле форматирования строки
+            self._symbol_to_ccxt = {
+                market.replace('/', ''): market for market in self._client.markets
+            }
+            self._ccxt_to_symbol = {
+                market: plain for plain, market in self._symbol_to_ccxt.items()
+            }
+
+            # Прогреваем TCP/TLS соединение дешевым запросом, чтобы первый
+            # fetch_tickers не платил за handshake + DNS (~50-150ms на cold start)
+            try:
+                await self._client.fetch_time()
+            except Exception as e:
+                logger.warning(f"Binance connection warm-up failed: {e}")
+
             logger.info(f"Connected to Binance {'testnet' if self.testnet else 'mainnet'}")
             return True
         except Exception as e:
@@ -41,19 +112,33 @@ class BinanceExchange(ExchangeBase):
         """Fetches the current price for a single symbol from Binance."""
         if not self._client:
             return None
+
+        # Короткий TTL-кеш: схлопывает дубли запросов одного символа
+        # внутри одного цикла проверки алертов
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < _PRICE_CACHE_TTL:
+            return cached[1]
+
         try:
             # CCXT uses format like 'BTC/USDT'
-            ccxt_symbol = f"{symbol[:-4]}/{symbol[-4:]}"
+            ccxt_symbol = self._symbol_to_ccxt.get(symbol)
+            if ccxt_symbol is None:
+                logger.error(f"Unknown Binance symbol: {symbol}")
+                return None
             ticker = await self._client.fetch_ticker(ccxt_symbol)
-            return PriceData(
+            price_data = PriceData(
                 exchange=self.exchange_type,
                 symbol=symbol,
                 price=float(ticker['last']),
                 volume_24h=float(ticker.get('baseVolume', 0)),
                 high_24h=float(ticker.get('high', 0)),
                 low_24h=float(ticker.get('low', 0)),
-                raw_data=ticker
+                # Полный тикер не храним: для 500+ символов это мегабайты,
+                # которые потом утекают в JSON storage и metadata результатов
+                raw_data={'bid': ticker.get('bid'), 'ask': ticker.get('ask')}
             )
+            self._price_cache[symbol] = (time.monotonic(), price_data)
+            return price_data
         except Exception as e:
             logger.error(f"Error fetching price for {symbol} from Binance: {e}")
             return None
@@ -65,18 +150,36 @@ class BinanceExchange(ExchangeBase):
         
         results = []
         try:
-            ccxt_symbols = [f"{s[:-4]}/{s[-4:]}" for s in symbols]
+            symbol_map = self._symbol_to_ccxt
+            ccxt_symbols = [symbol_map[s] for s in symbols if s in symbol_map]
+            if len(ccxt_symbols) != len(symbols):
+                dropped = [s for s in symbols if s not in symbol_map]
+                logger.error(f"Unknown Binance symbols skipped: {dropped}")
+            if not ccxt_symbols:
+                # fetch_tickers([]) ccxt трактует как "без фильтра"
+                # и утянул бы все тикеры биржи
+                return []
             tickers = await self._client.fetch_tickers(ccxt_symbols)
+
+            # Горячий цикл: model_construct пропускает pydantic-валидацию
+            # (значения уже приведены через float()), локальные алиасы
+            # убирают повторный поиск атрибутов на каждой итерации
+            construct = PriceData.model_construct
+            exchange_type = self.exchange_type
+            reverse_map = self._ccxt_to_symbol
+            # Один datetime.now() на весь батч вместо вызова на каждый тикер
+            now = datetime.now()
             for symbol, ticker in tickers.items():
-                original_symbol = symbol.replace('/', '')
-                results.append(PriceData(
-                    exchange=self.exchange_type,
-                    symbol=original_symbol,
+                ticker_get = ticker.get
+                results.append(construct(
+                    exchange=exchange_type,
+                    symbol=reverse_map.get(symbol) or symbol.replace('/', ''),
+                    timestamp=now,
                     price=float(ticker['last']),
-                    volume_24h=float(ticker.get('baseVolume', 0)),
-                    high_24h=float(ticker.get('high', 0)),
-                    low_24h=float(ticker.get('low', 0)),
-                    raw_data=ticker
+                    volume_24h=float(ticker_get('baseVolume', 0)),
+                    high_24h=float(ticker_get('high', 0)),
+                    low_24h=float(ticker_get('low', 0)),
+                    raw_data={'bid': ticker_get('bid'), 'ask': ticker_get('ask')}
                 ))
             return results
         except Exception as e:
@@ -87,6 +190,5 @@ class BinanceExchange(ExchangeBase):
         """Checks if a trading symbol is valid on Binance."""
         if not self._client or not self._client.markets:
             await self.connect()
-        
-        ccxt_symbol = f"{symbol[:-4]}/{symbol[-4:]}"
-        return ccxt_symbol in self._client.markets
+
+        return symbol in self._symbol_to_ccxt
@@ -1,7 +1,10 @@
 """
 Адаптер для биржи Bybit
 """
+import asyncio
 import logging
+import time
+from datetime import datetime
 from typing import List, Optional
 from pybit.unified_trading import HTTP
 from exchanges.base import ExchangeBase
@@ -10,10 +13,20 @@ from models.alert import ExchangeType
 
 logger = logging.getLogger(__name__)
 
+# Список инструментов Bybit меняется редко
+_INSTRUMENTS_CACHE_TTL = 86400
+
 
 class BybitExchange(ExchangeBase):
     """Адаптер для работы с Bybit API"""
-    
+
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, testnet: bool = False):
+        super().__init__(api_key, api_secret, testnet)
+        # Кеш существует с момента создания объекта: is_symbol_valid при
+        # неудавшемся (или не вызванном) connect() вернет False, а не
+        # упадет с AttributeError
+        self._instruments_cache = {}
+
     @property
     def exchange_type(self) -> ExchangeType:
         return ExchangeType.BYBIT
@@ -33,7 +46,14 @@ class BybitExchange(ExchangeBase):
                 # Публичный клиент для получения цен
                 self._client = HTTP(testnet=self.testnet)
                 logger.info(f"Подключение к Bybit {'testnet' if self.testnet else 'mainnet'} в публичном режиме")
-            
+
+            # Прогреваем HTTPS keep-alive соединение дешевым запросом,
+            # чтобы первый get_tickers не платил за TLS handshake + DNS
+            try:
+                await asyncio.to_thread(self._client.get_server_time)
+            except Exception as e:
+                logger.warning(f"Bybit connection warm-up failed: {e}")
+
             return True
         except Exception as e:
             logger.error(f"Ошибка подключения к Bybit: {e}")
@@ -42,8 +62,12 @@ class BybitExchange(ExchangeBase):
     async def get_price(self, symbol: str) -> Optional[PriceData]:
         """Получить цену торговой пары с Bybit"""
         try:
-            response = self._client.get_tickers(category="spot", symbol=symbol)
-            
+            # pybit блокирующий - выносим в thread pool, иначе на время
+            # round-trip'а замирает весь event loop (и Binance, и Telegram)
+            response = await asyncio.to_thread(
+                self._client.get_tickers, category="spot", symbol=symbol
+            )
+
             if response['retCode'] != 0:
                 logger.error(f"Ошибка API Bybit: {response.get('retMsg', 'Unknown error')}")
                 return None
@@ -53,39 +77,79 @@ class BybitExchange(ExchangeBase):
                 return None
             
             ticker = response['result']['list'][0]
-            price = float(ticker['lastPrice'])
-            
-            return PriceData(
-                exchange=self.exchange_type,
-                symbol=symbol,
-                price=price,
-                volume_24h=float(ticker.get('volume24h', 0)),
-                high_24h=float(ticker.get('highPrice24h', 0)) if ticker.get('highPrice24h') else None,
-                low_24h=float(ticker.get('lowPrice24h', 0)) if ticker.get('lowPrice24h') else None,
-                price_change_percent_24h=float(ticker.get('price24hPcnt', 0)) * 100 if ticker.get('price24hPcnt') else None,
-                raw_data=ticker
-            )
-            
+            return self._ticker_to_price_data(ticker)
+
         except Exception as e:
             logger.error(f"Ошибка получения цены {symbol} с Bybit: {e}")
             return None
-    
+
+    def _ticker_to_price_data(self, ticker: dict, timestamp: Optional[datetime] = None) -> PriceData:
+        """Преобразует тикер из ответа Bybit API в PriceData"""
+        return PriceData(
+            exchange=self.exchange_type,
+            symbol=ticker['symbol'],
+            timestamp=timestamp or datetime.now(),
+            price=float(ticker['lastPrice']),
+            volume_24h=float(ticker.get('volume24h', 0)),
+            high_24h=float(ticker.get('highPrice24h', 0)) if ticker.get('highPrice24h') else None,
+            low_24h=float(ticker.get('lowPrice24h', 0)) if ticker.get('lowPrice24h') else None,
+            price_change_percent_24h=float(ticker.get('price24hPcnt', 0)) * 100 if ticker.get('price24hPcnt') else None,
+            raw_data={'bid': ticker.get('bid1Price'), 'ask': ticker.get('ask1Price')}
+        )
+
     async def get_multiple_prices(self, symbols: List[str]) -> List[PriceData]:
-        """Получить цены нескольких пар с Bybit"""
-        results = []
-        
-        for symbol in symbols:
-            price_data = await self.get_price(symbol)
-            if price_data:
-                results.append(price_data)
-        
-        return results
+        """
+        Получить цены нескольких пар с Bybit.
+
+        Один запрос /v5/market/tickers возвращает все спотовые тикеры -
+        фильтруем нужные на клиенте вместо K последовательных round-trip'ов.
+        """
+        wanted = set(symbols)
+        try:
+            # pybit синхронный - выносим запрос в thread pool,
+            # чтобы не блокировать event loop
+            response = await asyncio.to_thread(
+                self._client.get_tickers, category="spot"
+            )
+
+            if response['retCode'] != 0:
+                raise RuntimeError(response.get('retMsg', 'Unknown error'))
+
+            results = []
+            # Один datetime.now() на весь батч вместо вызова на каждый тикер
+            now = datetime.now()
+            for ticker in response['result']['list']:
+                if ticker['symbol'] in wanted:
+                    try:
+                        results.append(self._ticker_to_price_data(ticker, timestamp=now))
+                    except Exception as e:
+                        logger.warning(f"Не удалось распарсить тикер {ticker.get('symbol')}: {e}")
+            return results
+
+        except Exception as e:
+            # Fallback на по-символьные запросы, если батч не сработал
+            logger.warning(f"Батч-запрос тикеров Bybit не удался ({e}), переходим на по-символьные запросы")
+            results = []
+            for symbol in symbols:
+                price_data = await self.get_price(symbol)
+                if price_data:
+                    results.append(price_data)
+            return results
     
     async def is_symbol_valid(self, symbol: str) -> bool:
         """Проверить существует ли пара на Bybit"""
+        # Список инструментов меняется редко - кешируем ответы на сутки
+        cached = self._instruments_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < _INSTRUMENTS_CACHE_TTL:
+            return cached[1]
+
         try:
-            response = self._client.get_instruments_info(category="spot", symbol=symbol)
-            return response['retCode'] == 0 and bool(response['result']['list'])
+            response = await asyncio.to_thread(
+                self._client.get_instruments_info, category="spot", symbol=symbol
+            )
+            valid = response['retCode'] == 0 and bool(response['result']['list'])
+            self._instruments_cache[symbol] = (time.monotonic(), valid)
+            return valid
         except Exception as e:
             logger.error(f"Ошибка проверки символа {symbol}: {e}")
             return False
@@ -2,7 +2,11 @@
 
 from aiogram import types, Router
 from aiogram.filters import CommandStart, Command
-from models.alert import ExchangeType, AlertCondition, AlertTarget
+from models.alert import (
+    AlertTarget,
+    CONDITION_BY_VALUE,
+    EXCHANGE_BY_VALUE,
+)
 
 # "Router" — это как мини-мозг для набора команд.
 router = Router()
@@ -43,7 +47,10 @@ async def handle_set_key(message: types.Message):
     """
     Этот код сохраняет Pushover User Key
     """
-    user_key = message.text.replace("/set_key", "").strip()
+    # partition вместо replace: один проход по строке и не ломает ключи,
+    # в которых случайно встретится подстрока "/set_key"
+    _, _, user_key = message.text.partition(' ')
+    user_key = user_key.strip()
 
     if len(user_key) == 30:
         # TODO: Здесь будет ваш код для сохранения user_key в базу данных.
@@ -59,8 +66,9 @@ async def handle_add_alert(message: types.Message):
     Формат: /add_alert <биржа> <пара> <условие> <цена>
     Пример: /add_alert bybit BTCUSDT above 80000
     """
-    parts = message.text.split()
-    
+    # maxsplit=4: ровно 5 частей, без лишних аллокаций на длинных сообщениях
+    parts = message.text.split(maxsplit=4)
+
     # Проверяем, что команда введена в правильном формате
     if len(parts) != 5:
         await message.answer(
@@ -76,8 +84,8 @@ async def handle_add_alert(message: types.Message):
 
     # --- Преобразуем текст в наши модели данных ---
     try:
-        exchange = ExchangeType(exchange_str.lower())
-        condition = AlertCondition(condition_str.lower())
+        exchange = EXCHANGE_BY_VALUE[exchange_str.lower()]
+        condition = CONDITION_BY_VALUE[condition_str.lower()]
         target_price = float(price_str)
         user_id = str(message.from_user.id) # user_id должен быть строкой для совместимости
     except (ValueError, KeyError):
@@ -103,6 +111,6 @@ async def handle_add_alert(message: types.Message):
 
     if success:
         await message.answer(f"✅ Алерт создан: {new_alert.name}")
-        print(f"Новый алерт сохранен: {new_alert.dict()}")
+        print(f"Новый алерт сохранен: {new_alert.model_dump()}")
     else:
         await message.answer("❌ Не удалось сохранить алерт. Попробуйте позже.")
@@ -17,6 +17,7 @@ from services.notification import NotificationService
 from storage.json_storage import JSONStorage
 from exchange_adapters.factory import create_exchange_adapters
 from utils.config import load_config
+from utils.http import close_shared_session
 from utils.logger import setup_logging
 from storage.base import StorageBase
 
@@ -26,13 +27,35 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 async def run_alert_checks_periodically(alert_manager: AlertManager, interval_seconds: int):
-    """Запускает проверку алертов в бесконечном цикле."""
+    """
+    Запускает проверку алертов в бесконечном цикле.
+
+    Планировщик компенсирует дрейф: следующая проверка назначается на
+    t0 + k*interval по монотонным часам, а не на "после работы + пауза".
+    Медленный цикл не сдвигает все последующие.
+    """
+    loop = asyncio.get_running_loop()
+    next_check = loop.time()
     while True:
+        next_check += interval_seconds
         try:
-            await alert_manager.check_all_alerts()
+            # Таймаут не дает зависшему HTTP-запросу заблокировать планировщик
+            await asyncio.wait_for(
+                alert_manager.check_all_alerts(),
+                timeout=interval_seconds * 0.9
+            )
+        except asyncio.TimeoutError:
+            logging.error(f"Alert check cycle timed out after {interval_seconds * 0.9:.0f}s")
         except Exception as e:
             logging.error(f"An error occurred during the alert check cycle: {e}", exc_info=True)
-        await asyncio.sleep(interval_seconds)
+
+        delay = next_check - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            # Цикл занял дольше интервала - начинаем следующий сразу,
+            # но выравниваем расписание, чтобы не копить отставание
+            next_check = loop.time()
 
 
 async def main():
@@ -40,6 +63,7 @@ async def main():
     setup_logging()
     logger = logging.getLogger(__name__)
 
+    notification_service = None
     try:
         # 1. Загружаем конфигурацию, указывая путь к .env файлу
         config = load_config(env_path=os.path.join(PROJECT_ROOT, '.env'))
@@ -58,7 +82,8 @@ async def main():
         alert_manager = AlertManager(
             price_checker=price_checker,
             notification_service=notification_service,
-            storage_service=storage
+            storage_service=storage,
+            max_concurrency=config.app.max_concurrent_checks
         )
         
         # 4. Настраиваем Telegram-бота
@@ -83,6 +108,13 @@ async def main():
         logger.info("Bot stopped.")
     except Exception as e:
         logger.critical(f"Critical error in main function: {e}", exc_info=True)
+    finally:
+        # Даем фоновой очереди уведомлений дослать остатки
+        if notification_service is not None:
+            await notification_service.close()
+        # Общий aiohttp-пул (его использует ccxt) закрываем явно,
+        # иначе aiohttp ругается на незакрытые коннекторы при выходе
+        await close_shared_session()
 
 
 if __name__ == "__main__":
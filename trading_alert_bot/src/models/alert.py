@@ -4,7 +4,13 @@ Alert-related data models
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+# Паттерн торговой пары: шарится между AlertTarget и PriceData.
+# Применяется только на границе API (пользовательский ввод);
+# доверенные внутренние пути используют model_construct
+# и пропускают валидацию.
+SYMBOL_PATTERN = r'^[A-Z]{3,10}[A-Z]{3,5}$'
 
 
 class ExchangeType(str, Enum):
@@ -32,12 +38,20 @@ class AlertStatus(str, Enum):
     EXPIRED = "expired"
 
 
+# Dict-кеши value -> member: прямой поиск по dict дешевле вызова
+# ExchangeType(v) в горячих путях (парсинг команд, десериализация).
+# Поиск несуществующего значения дает KeyError вместо ValueError.
+EXCHANGE_BY_VALUE = {e.value: e for e in ExchangeType}
+CONDITION_BY_VALUE = {c.value: c for c in AlertCondition}
+STATUS_BY_VALUE = {s.value: s for s in AlertStatus}
+
+
 class AlertTarget(BaseModel):
     """Configuration for a price alert"""
     id: Optional[str] = Field(None, description="Unique alert identifier")
     name: str = Field(..., description="Human-readable alert name")
     exchange: ExchangeType = Field(..., description="Target exchange")
-    symbol: str = Field(..., pattern=r'^[A-Z]{3,10}[A-Z]{3,5}$', description="Trading pair symbol")
+    symbol: str = Field(..., pattern=SYMBOL_PATTERN, description="Trading pair symbol")
     target_price: float = Field(..., gt=0, description="Target price")
     condition: AlertCondition = Field(..., description="Trigger condition")
     
@@ -56,17 +70,19 @@ class AlertTarget(BaseModel):
     user_id: Optional[str] = Field(None, description="User identifier")
     notes: Optional[str] = Field(None, max_length=500, description="User notes")
     
-    @validator('symbol')
+    @field_validator('symbol')
+    @classmethod
     def validate_symbol(cls, v):
         """Validate trading pair symbol format"""
         if not v.isupper():
             raise ValueError('Symbol must be uppercase')
         return v
-    
-    @validator('percentage_threshold')
-    def validate_percentage_threshold(cls, v, values):
+
+    @field_validator('percentage_threshold')
+    @classmethod
+    def validate_percentage_threshold(cls, v, info: ValidationInfo):
         """Validate percentage threshold is provided for percent_change condition"""
-        if values.get('condition') == AlertCondition.PERCENT_CHANGE and v is None:
+        if info.data.get('condition') == AlertCondition.PERCENT_CHANGE and v is None:
             raise ValueError('percentage_threshold required for percent_change condition')
         return v
     
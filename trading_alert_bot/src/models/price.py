@@ -4,13 +4,13 @@ Price-related data models
 from datetime import datetime
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
-from models.alert import ExchangeType
+from models.alert import ExchangeType, SYMBOL_PATTERN
 
 
 class PriceData(BaseModel):
     """Current price data from exchange"""
     exchange: ExchangeType
-    symbol: str = Field(..., pattern=r'^[A-Z]{3,10}[A-Z]{3,5}$')
+    symbol: str = Field(..., pattern=SYMBOL_PATTERN)
     price: float = Field(..., gt=0)
     timestamp: datetime = Field(default_factory=datetime.now)
     
@@ -60,13 +60,26 @@ class MarketSummary(BaseModel):
     price_spread_percent: Optional[float] = None
     
     def calculate_aggregates(self):
-        """Calculate aggregate statistics"""
+        """Calculate aggregate statistics (один проход вместо четырех)"""
         if not self.prices:
             return
-        
-        prices = [data.price for data in self.prices.values()]
-        self.average_price = sum(prices) / len(prices)
-        self.price_spread = max(prices) - min(prices)
+
+        it = iter(self.prices.values())
+        first = next(it).price
+        lo = hi = first
+        total = first
+        n = 1
+        for data in it:
+            p = data.price
+            total += p
+            if p < lo:
+                lo = p
+            elif p > hi:
+                hi = p
+            n += 1
+
+        self.average_price = total / n
+        self.price_spread = hi - lo
         if self.average_price > 0:
             self.price_spread_percent = (self.price_spread / self.average_price) * 100
     
@@ -2,17 +2,41 @@
 
 import asyncio
 import logging
+import operator
 from collections import defaultdict
 from datetime import datetime, timezone
 
+import numpy as np
+
 # --- Импорты ваших моделей и сервисов ---
 from models.alert import AlertTarget, AlertResult, AlertCondition
+from services.alert_evaluator import (
+    CONDITION_CODES,
+    PRICE_SCALE,
+    evaluate_conditions,
+    quantize_price,
+)
 from services.price_checker import PriceChecker
 from services.notification import NotificationService
 from storage.base import StorageBase
 
 logger = logging.getLogger(__name__)
 
+# До этого размера скалярный цикл быстрее, чем сборка numpy-массивов
+_VECTORIZE_MIN_ALERTS = 100
+
+# Сентинел "цены нет" для int64-массива цен (цены всегда > 0)
+_MISSING_PRICE = -1
+
+# Dict-dispatch компараторов вместо if/elif-цепочки: один поиск по dict
+# и вызов C-функции из operator на каждый алерт скалярного пути.
+# PERCENT_CHANGE не сводится к бинарному сравнению и обрабатывается отдельно.
+_CMP = {
+    AlertCondition.ABOVE: operator.gt,
+    AlertCondition.BELOW: operator.lt,
+    AlertCondition.EQUAL: operator.eq,
+}
+
 class AlertManager:
     """
     Главный сервис, который управляет жизненным циклом алертов:
@@ -26,11 +50,145 @@ class AlertManager:
         self,
         price_checker: PriceChecker,
         notification_service: NotificationService,
-        storage_service: StorageBase
+        storage_service: StorageBase,
+        max_concurrency: int = 10
     ):
         self.price_checker = price_checker
         self.notification_service = notification_service
         self.storage = storage_service
+        # Ограничивает параллелизм fan-out'ов (цены, уведомления):
+        # без предела gather заваливает API бирж и нотификации разом.
+        # Значение приходит из AppConfig.max_concurrent_checks.
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+        # Кеш загруженных алертов: перечитываем хранилище только когда
+        # его version-счетчик сдвинулся (мутации из handlers или цикла)
+        self._alerts_cache: list | None = None
+        self._alerts_version = -1
+        # {exchange: [symbols]} - строится вместе с SoA при обновлении кеша
+        self._grouped_symbols: dict = {}
+
+        # SoA-представление активных алертов: атрибуты, нужные горячему
+        # циклу, лежат в отдельных непрерывных массивах вместо разбросанных
+        # по куче pydantic-объектов. Перестраивается при загрузке алертов.
+        self._soa_alerts: list = []
+        self._soa_keys: list = []
+        self._soa_unique_keys: list = []
+        self._soa_key_index = np.empty(0, dtype=np.intp)
+        self._soa_targets = np.empty(0, dtype=np.float64)
+        self._soa_conditions = np.empty(0, dtype=np.int8)
+        self._soa_thresholds = np.empty(0, dtype=np.float64)
+
+    async def _bounded(self, coro):
+        """Выполняет корутину под семафором, ограничивая параллелизм."""
+        async with self._sem:
+            return await coro
+
+    def _rebuild_soa(self, active_alerts):
+        """Перестраивает колоночное представление по списку активных алертов."""
+        n = len(active_alerts)
+        self._soa_alerts = active_alerts
+        self._soa_keys = [(a.exchange, a.symbol) for a in active_alerts]
+        # Много алертов делят одну пару (exchange, symbol): цены ищем
+        # один раз на уникальный ключ, а на алерты разворачиваем
+        # numpy-индексацией вместо N dict-поисков
+        key_to_idx = {}
+        index_iter = []
+        for key in self._soa_keys:
+            idx = key_to_idx.get(key)
+            if idx is None:
+                idx = len(key_to_idx)
+                key_to_idx[key] = idx
+            index_iter.append(idx)
+        self._soa_unique_keys = list(key_to_idx)
+        self._soa_key_index = np.fromiter(index_iter, dtype=np.intp, count=n)
+        # Цены храним как int64 fixed-point: SIMD-сравнения без NaN
+        self._soa_targets = np.fromiter(
+            (quantize_price(a.target_price) for a in active_alerts),
+            dtype=np.int64, count=n,
+        )
+        self._soa_conditions = np.fromiter(
+            (CONDITION_CODES[a.condition] for a in active_alerts),
+            dtype=np.int8, count=n,
+        )
+        self._soa_thresholds = np.fromiter(
+            (
+                a.percentage_threshold if a.percentage_threshold is not None else np.inf
+                for a in active_alerts
+            ),
+            dtype=np.float64, count=n,
+        )
+
+    @staticmethod
+    def _evaluate_scalar(alerts, prices):
+        """Скалярная проверка условий для маленьких батчей (alert, price)."""
+        flags = []
+        for alert, price in zip(alerts, prices):
+            target = alert.target_price
+            cmp = _CMP.get(alert.condition)
+            if cmp is not None:
+                flags.append(cmp(price, target))
+            elif alert.condition == AlertCondition.PERCENT_CHANGE:
+                threshold = alert.percentage_threshold
+                flags.append(
+                    threshold is not None
+                    and abs(price - target) / target * 100.0 >= threshold
+                )
+            else:
+                flags.append(False)
+        return flags
+
+    def _find_triggered(self, current_prices):
+        """
+        Возвращает список (alert, price) сработавших алертов.
+
+        Маленькие батчи считаются скалярным циклом; начиная с
+        _VECTORIZE_MIN_ALERTS работаем по SoA-массивам (self._soa_*):
+        цены раскладываются в массив, выровненный с колонками алертов,
+        отсутствующие цены кодируются NaN и никогда не триггерят.
+        """
+        alerts = self._soa_alerts
+        n = len(alerts)
+        if n < _VECTORIZE_MIN_ALERTS:
+            checked_alerts = []
+            checked_prices = []
+            for alert, key in zip(alerts, self._soa_keys):
+                current_price = current_prices.get(key)
+                if current_price is None:
+                    logger.warning(f"Could not get price for {alert.symbol} on {alert.exchange}. Skipping alert '{alert.name}'.")
+                    continue
+                checked_alerts.append(alert)
+                checked_prices.append(current_price)
+
+            flags = self._evaluate_scalar(checked_alerts, checked_prices)
+            return [
+                (alert, price)
+                for alert, price, triggered in zip(checked_alerts, checked_prices, flags)
+                if triggered
+            ]
+
+        prices_get = current_prices.get
+        unique_prices = np.fromiter(
+            (
+                quantize_price(price) if (price := prices_get(key)) is not None
+                else _MISSING_PRICE
+                for key in self._soa_unique_keys
+            ),
+            dtype=np.int64, count=len(self._soa_unique_keys),
+        )
+        # Fancy-indexing разворачивает цены уникальных пар на все алерты
+        price_arr = unique_prices[self._soa_key_index]
+        valid = price_arr != _MISSING_PRICE
+        missing = n - int(valid.sum())
+        if missing:
+            logger.warning(f"Could not get prices for {missing} of {n} alerts. Skipping them.")
+
+        mask = evaluate_conditions(
+            price_arr, self._soa_targets, self._soa_conditions, self._soa_thresholds
+        )
+        mask &= valid
+        # Обратно в float только для сработавших алертов
+        return [(alerts[i], price_arr[i] / PRICE_SCALE) for i in np.nonzero(mask)[0]]
 
     async def check_all_alerts(self):
         """
@@ -38,97 +196,116 @@ class AlertManager:
         """
         logger.info("Starting new alert check cycle...")
         
-        # 1. Загружаем все алерты из хранилища
-        try:
-            all_alerts = await self.storage.load_alerts()
-        except Exception as e:
-            logger.error(f"Failed to load alerts from storage: {e}")
-            return
+        # 1. Загружаем алерты: из хранилища только если оно менялось,
+        # иначе работаем с кешем прошлого цикла
+        storage_version = self.storage.version
+        if self._alerts_cache is None or storage_version != self._alerts_version:
+            try:
+                # Хранилище отдает уже отфильтрованные активные алерты:
+                # неактивные не проходят даже через валидацию модели
+                self._alerts_cache = await self.storage.load_active_alerts()
+                self._alerts_version = storage_version
+            except Exception as e:
+                logger.error(f"Failed to load alerts from storage: {e}")
+                return
+            # SoA-колонки и группировка по биржам перестраиваются
+            # только при обновлении кеша, а не каждый цикл
+            self._rebuild_soa(self._alerts_cache)
+            grouped = defaultdict(list)
+            for exchange, symbol in self._soa_unique_keys:
+                grouped[exchange].append(symbol)
+            self._grouped_symbols = dict(grouped)
 
-        # Фильтруем только активные алерты, которые могут сработать
-        active_alerts = [alert for alert in all_alerts if alert.can_trigger()]
+        active_alerts = self._soa_alerts
         if not active_alerts:
             logger.info("No active alerts to check.")
             return
-        
-        # 2. Группируем алерты, чтобы эффективно получать цены
-        # Структура: {exchange: {symbol: [alert1, alert2, ...]}}
-        alerts_to_check = defaultdict(lambda: defaultdict(list))
-        for alert in active_alerts:
-            alerts_to_check[alert.exchange][alert.symbol].append(alert)
-
-        # 3. Асинхронно получаем все необходимые цены
-        price_tasks = []
-        for exchange, symbols in alerts_to_check.items():
-            price_tasks.append(
-                self.price_checker.get_prices_for_exchange(exchange, list(symbols.keys()))
-            )
-        
-        # Результат будет списком списков [ [price_data1, price_data2], [price_data3] ]
-        price_results_list = await asyncio.gather(*price_tasks, return_exceptions=True)
-        
-        # Преобразуем результат в удобный словарь { (exchange, symbol): price }
-        current_prices = {}
-        for result in price_results_list:
-            if isinstance(result, list):
-                for price_data in result:
-                    key = (price_data.exchange, price_data.symbol)
-                    current_prices[key] = price_data.price
-            elif isinstance(result, Exception):
-                logger.error(f"Error fetching prices: {result}")
-
 
-        # 4. Проверяем условия для каждого алерта
-        triggered_results = []
-        for alert in active_alerts:
-            price_key = (alert.exchange, alert.symbol)
-            current_price = current_prices.get(price_key)
+        # 2-3. Асинхронно получаем цены по заранее сгруппированным символам
+        price_tasks = [
+            self._bounded(self.price_checker.get_prices_for_exchange(exchange, symbols))
+            for exchange, symbols in self._grouped_symbols.items()
+        ]
 
-            if current_price is None:
-                logger.warning(f"Could not get price for {alert.symbol} on {alert.exchange}. Skipping alert '{alert.name}'.")
+        # as_completed вместо gather(return_exceptions=True): результаты
+        # быстрых бирж разбираем (а их ошибки логируем) сразу по мере
+        # готовности, не дожидаясь самой медленной биржи
+        current_prices = {}
+        for future in asyncio.as_completed(price_tasks):
+            try:
+                price_list = await future
+            except Exception as e:
+                logger.error(f"Error fetching prices: {e}")
                 continue
+            for price_data in price_list:
+                key = (price_data.exchange, price_data.symbol)
+                current_prices[key] = price_data.price
 
-            triggered = False
-            if alert.condition == AlertCondition.ABOVE and current_price > alert.target_price:
-                triggered = True
-            elif alert.condition == AlertCondition.BELOW and current_price < alert.target_price:
-                triggered = True
-            elif alert.condition == AlertCondition.EQUAL and current_price == alert.target_price:
-                triggered = True
-            
-            if triggered:
-                logger.info(f"Alert '{alert.name}' triggered for {alert.symbol} at price {current_price}")
-                result = AlertResult(
-                    alert=alert,
-                    current_price=current_price,
-                    triggered=True
-                )
-                triggered_results.append(result)
+
+        # 4. Проверяем условия по SoA-представлению
+        triggered_pairs = self._find_triggered(current_prices)
+
+        triggered_results = []
+        # Один datetime.now() на цикл вместо вызова на каждый AlertResult
+        cycle_time = datetime.now()
+        for alert, current_price in triggered_pairs:
+            logger.info(f"Alert '{alert.name}' triggered for {alert.symbol} at price {current_price}")
+            result = AlertResult(
+                alert=alert,
+                current_price=current_price,
+                triggered=True,
+                timestamp=cycle_time
+            )
+            triggered_results.append(result)
 
         # 5. Если есть сработавшие алерты, отправляем уведомления и обновляем их
         if not triggered_results:
             logger.info("Alert check cycle completed. No alerts were triggered.")
             return
 
+        # Данные всех пользователей забираем одним чтением на цикл,
+        # вместо похода в хранилище на каждое уведомление
+        try:
+            all_user_data = await self.storage.get_all_user_data()
+        except Exception as e:
+            logger.error(f"Failed to prefetch user data: {e}")
+            all_user_data = {}
+
         # Асинхронно отправляем все уведомления
         notification_tasks = [
-            self.notification_service.send_alert_notification(result)
+            self.notification_service.send_alert_notification(
+                result, user_data=all_user_data.get(result.alert.user_id)
+            )
             for result in triggered_results
         ]
-        await asyncio.gather(*notification_tasks, return_exceptions=True)
+        await asyncio.gather(
+            *(self._bounded(task) for task in notification_tasks),
+            return_exceptions=True
+        )
         
-        # Асинхронно обновляем алерты в базе данных
-        update_tasks = []
+        # Обновляем сработавшие алерты одной пакетной операцией.
+        # Время снимаем один раз: clock_gettime на каждый алерт не нужен
+        now_utc = datetime.now(timezone.utc)
+        alerts_to_update = []
         for result in triggered_results:
             alert_to_update = result.alert
             alert_to_update.triggered_count += 1
-            alert_to_update.last_triggered_at = datetime.now(timezone.utc)
+            alert_to_update.last_triggered_at = now_utc
             # Если алерт одноразовый, деактивируем его
             if alert_to_update.max_triggers == 1:
                 alert_to_update.active = False
-            
-            update_tasks.append(self.storage.update_alert(alert_to_update))
-            
-        await asyncio.gather(*update_tasks, return_exceptions=True)
-        
+
+            alerts_to_update.append(alert_to_update)
+
+        try:
+            await self.storage.bulk_update_alerts(alerts_to_update)
+        except Exception as e:
+            logger.error(f"Failed to bulk-update triggered alerts: {e}")
+
+        # Одна запись на диск за всю пачку обновлений
+        try:
+            await self.storage.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush storage: {e}")
+
         logger.info(f"Alert check cycle completed. {len(triggered_results)} alerts were triggered and processed.")
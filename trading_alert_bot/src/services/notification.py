@@ -1,28 +1,80 @@
 """Notification Service"""
 import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import chump
 from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.exceptions import TelegramAPIError
 
-from models.alert import AlertResult
+from models.alert import AlertResult, ExchangeType
 from utils.config import NotificationConfig
 from storage.base import StorageBase
 
 logger = logging.getLogger(__name__)
 
+# Предел очереди Pushover-отправок: при переполнении send_critical_alert
+# начинает ждать (backpressure) вместо неограниченного роста памяти
+_NOTIFY_QUEUE_MAX = 100
+
+# Telegram ограничивает бота ~30 сообщениями в секунду: шлем параллельно,
+# но не больше этого числа одновременных запросов
+_TG_MAX_CONCURRENT_SENDS = 25
+
+# Число параллельных Pushover-отправок: столько воркеров разбирает
+# очередь и столько же потоков в выделенном executor'е
+_PUSHOVER_WORKERS = 4
+
+# Шаблоны сообщений и отображаемые имена бирж собраны один раз на модуль:
+# при всплеске сработавших алертов не пересобираем константные куски
+# и не зовем .value.upper() на каждое уведомление
+_EXCHANGE_DISPLAY = {e: e.value.upper() for e in ExchangeType}
+
+_TG_TEMPLATE = (
+    "🔔 **Сработал алерт: {name}**\n\n"
+    "**Пара:** `{symbol}`\n"
+    "**Биржа:** {exchange}\n"
+    "**Текущая цена:** `${price:,.2f}`"
+)
+_PUSHOVER_TITLE_TEMPLATE = "🚨 Сработал алерт: {name}"
+_PUSHOVER_BODY_TEMPLATE = (
+    "Пара {symbol} на бирже {exchange} достигла цены ${price:,.2f}."
+)
+
+
 class NotificationService:
     def __init__(self, config: NotificationConfig, storage: StorageBase):
         self.config = config
         self.storage = storage
         self.telegram_bot: Bot | None = None
         self.pushover_client: chump.Client | None = None
+        # chump.get_user валидирует ключ HTTP-запросом: кешируем User,
+        # чтобы повторные алерты одного пользователя не платили round-trip
+        self._pushover_users: dict = {}
+        # Отправки Pushover уходят в фоновую очередь: цикл проверки не
+        # ждет HTTP round-trip каждого уведомления
+        self._notify_queue: asyncio.Queue | None = None
+        self._notify_worker_tasks: list[asyncio.Task] = []
+        # Ограничивает одновременные send_message, чтобы gather
+        # уведомлений не упирался в rate limit Telegram
+        self._tg_sem = asyncio.Semaphore(_TG_MAX_CONCURRENT_SENDS)
+        # Отдельный пул для блокирующих Pushover-запросов: default
+        # executor делят file I/O хранилища и DNS, и всплеск отправок
+        # не должен их голодить
+        self._pushover_executor = ThreadPoolExecutor(
+            max_workers=_PUSHOVER_WORKERS, thread_name_prefix="pushover"
+        )
 
     async def initialize(self):
         if self.config.telegram_enabled and self.config.telegram_bot_token:
             try:
-                self.telegram_bot = Bot(token=self.config.telegram_bot_token)
+                # Явная AiohttpSession: один TCP-пул с keep-alive на всю
+                # жизнь бота, параллельные send_message делят соединения
+                self.telegram_bot = Bot(
+                    token=self.config.telegram_bot_token,
+                    session=AiohttpSession(limit=_TG_MAX_CONCURRENT_SENDS),
+                )
                 bot_info = await self.telegram_bot.get_me()
                 logger.info(f"Telegram bot initialized successfully: @{bot_info.username}")
             except TelegramAPIError as e:
@@ -41,19 +93,33 @@ class NotificationService:
                 logger.error(f"Failed to initialize Pushover client: {e}")
                 self.pushover_client = None
 
-    async def send_alert_notification(self, result: AlertResult):
+        if self.pushover_client:
+            self._notify_queue = asyncio.Queue(maxsize=_NOTIFY_QUEUE_MAX)
+            # Несколько воркеров над одной очередью: всплеск из K алертов
+            # уходит параллельными отправками, а не K последовательными
+            # round-trip'ами одного воркера
+            self._notify_worker_tasks = [
+                asyncio.create_task(self._notify_worker())
+                for _ in range(_PUSHOVER_WORKERS)
+            ]
+
+    async def send_alert_notification(self, result: AlertResult, user_data: dict | None = None):
         """
         Главный метод для отправки уведомлений.
-        Теперь он сам получает данные пользователя из хранилища.
+
+        user_data можно передать снаружи (AlertManager префетчит данные
+        всех пользователей одним чтением на цикл); без него данные
+        запрашиваются из хранилища, как раньше.
         """
         logger.info(f"Processing triggered alert: {result.alert.name}")
-        
+
         user_id = result.alert.user_id
         if not user_id:
             logger.error(f"Alert '{result.alert.name}' has no user_id. Cannot send notification.")
             return
 
-        user_data = await self.storage.get_user_data(user_id)
+        if user_data is None:
+            user_data = await self.storage.get_user_data(user_id)
         user_pushover_key = user_data.get("pushover_key")
         user_telegram_chat_id = user_data.get("chat_id")
 
@@ -70,38 +136,85 @@ class NotificationService:
     async def send_telegram_message(self, result: AlertResult, chat_id: str):
         if not self.telegram_bot:
             return
-        message_text = (
-            f"🔔 **Сработал алерт: {result.alert.name}**\n\n"
-            f"**Пара:** `{result.alert.symbol}`\n"
-            f"**Биржа:** {result.alert.exchange.value.upper()}\n"
-            f"**Текущая цена:** `${result.current_price:,.2f}`"
+        message_text = _TG_TEMPLATE.format(
+            name=result.alert.name,
+            symbol=result.alert.symbol,
+            exchange=_EXCHANGE_DISPLAY[result.alert.exchange],
+            price=result.current_price,
         )
         try:
-            await self.telegram_bot.send_message(chat_id, message_text, parse_mode="Markdown")
+            async with self._tg_sem:
+                await self.telegram_bot.send_message(chat_id, message_text, parse_mode="Markdown")
             logger.info(f"Standard alert for '{result.alert.name}' sent to Telegram chat {chat_id}.")
         except TelegramAPIError as e:
             logger.error(f"Failed to send Telegram message to {chat_id}: {e}")
 
+    def _send_pushover_sync(self, user_key: str, title: str, message_body: str):
+        """
+        Блокирующая отправка через Pushover (вызывается из executor-потока).
+
+        get_user, create_message и send собраны в один executor-вызов:
+        каждый из них ходит по сети, и раскидывать их по отдельным hop'ам
+        нет смысла. User кешируется по ключу.
+        """
+        user = self._pushover_users.get(user_key)
+        if user is None:
+            user = self.pushover_client.get_user(user_key)
+            self._pushover_users[user_key] = user
+        message = user.create_message(
+            title=title,
+            message=message_body,
+            sound='persistent',
+            priority=2,
+            retry=30,
+            expire=3600
+        )
+        message.send()
+
+    async def _notify_worker(self):
+        """Фоновый воркер: разбирает очередь и выполняет блокирующие отправки."""
+        loop = asyncio.get_running_loop()
+        while True:
+            user_key, title, message_body, alert_name = await self._notify_queue.get()
+            try:
+                await loop.run_in_executor(
+                    self._pushover_executor,
+                    self._send_pushover_sync, user_key, title, message_body
+                )
+                logger.info(f"Critical alert for '{alert_name}' sent successfully via Pushover.")
+            except Exception as e:
+                logger.error(f"Failed to send Pushover notification for user {user_key}: {e}")
+            finally:
+                self._notify_queue.task_done()
+
     async def send_critical_alert(self, result: AlertResult, user_key: str):
-        if not self.pushover_client:
+        if not self.pushover_client or self._notify_queue is None:
             return
-        title = f"🚨 Сработал алерт: {result.alert.name}"
-        message_body = (
-            f"Пара {result.alert.symbol} на бирже {result.alert.exchange.value.upper()} "
-            f"достигла цены ${result.current_price:,.2f}."
+        title = _PUSHOVER_TITLE_TEMPLATE.format(name=result.alert.name)
+        message_body = _PUSHOVER_BODY_TEMPLATE.format(
+            symbol=result.alert.symbol,
+            exchange=_EXCHANGE_DISPLAY[result.alert.exchange],
+            price=result.current_price,
         )
-        try:
-            user = self.pushover_client.get_user(user_key)
-            message = user.create_message(
-                title=title,
-                message=message_body,
-                sound='persistent',
-                priority=2,
-                retry=30,
-                expire=3600
-            )
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, message.send)
-            logger.info(f"Critical alert for '{result.alert.name}' sent successfully via Pushover.")
-        except Exception as e:
-            logger.error(f"Failed to send Pushover notification for user {user_key}: {e}")
+        # Кладем в очередь и возвращаемся: HTTP round-trip делает воркер.
+        # При заполненной очереди put притормаживает отправителя.
+        await self._notify_queue.put((user_key, title, message_body, result.alert.name))
+
+    async def drain(self):
+        """
+        Дожидается отправки всего, что лежит в очереди Pushover.
+
+        Обязателен в Lambda: окружение замораживается сразу после
+        return из handler'а, и неразобранная очередь зависла бы до
+        следующего инвока (или потерялась при teardown).
+        """
+        if self._notify_queue is not None:
+            await self._notify_queue.join()
+
+    async def close(self):
+        """Дожидается отправки всего из очереди и останавливает воркеров."""
+        await self.drain()
+        for task in self._notify_worker_tasks:
+            task.cancel()
+        self._notify_worker_tasks = []
+        self._pushover_executor.shutdown(wait=False)
@@ -1,21 +1,135 @@
 """Price Checker Service"""
+import asyncio
 import logging
-from typing import List, Optional
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from models.price import PriceData
 from models.alert import ExchangeType
+from utils.http import close_shared_session, get_shared_session
 
 logger = logging.getLogger(__name__)
 
+# Ограничение одновременных запросов к одной бирже (rate limits
+# у бирж отдельные, поэтому и семафор на каждую свой)
+_MAX_CONCURRENT_REQUESTS = 10
+
+# TTL кеша цен: циклы, идущие чаще обновления данных биржи,
+# не должны превращаться в повторные HTTP-запросы за той же ценой
+_PRICE_CACHE_TTL = 5.0
+
+
 class PriceChecker:
+    """
+    Фасад над адаптерами бирж.
+
+    HTTP-транспорт адаптеров (ccxt) переиспользует общий keep-alive пул
+    из utils.http; start()/close() управляют его жизненным циклом, а
+    пер-биржевые семафоры не дают gather превысить rate limit отдельной
+    биржи при параллельном опросе.
+    """
     def __init__(self, exchanges_dict):
         self.exchanges = exchanges_dict
-    
+        self._semaphores = {
+            exchange: asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+            for exchange in exchanges_dict
+        }
+        # {(exchange, symbol): (monotonic_ts, PriceData)}
+        self._price_cache: Dict[Tuple[ExchangeType, str], Tuple[float, PriceData]] = {}
+
+    def _semaphore_for(self, exchange: ExchangeType) -> asyncio.Semaphore:
+        sem = self._semaphores.get(exchange)
+        if sem is None:
+            sem = self._semaphores[exchange] = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        return sem
+
+    async def start(self):
+        """Создает общий HTTP-пул заранее, до первого запроса цен."""
+        get_shared_session()
+
+    async def close(self):
+        """Закрывает общий HTTP-пул (на shutdown приложения)."""
+        await close_shared_session()
+
     async def get_price(self, exchange: ExchangeType, symbol: str) -> Optional[PriceData]:
         """Get price for symbol from exchange"""
-        # TODO: Implement price fetching
-        return None
-    
-    async def get_prices_for_exchange(self, exchange: ExchangeType, symbols: List[str]) -> List[PriceData]:
-        """Get multiple prices from one exchange"""
-        # TODO: Implement batch price fetching
-        return []
+        exchange_adapter = self.exchanges.get(exchange)
+        if not exchange_adapter:
+            logger.error(f"Exchange {exchange} not found in available exchanges")
+            return None
+
+        cached = self._price_cache.get((exchange, symbol))
+        if cached is not None and time.monotonic() - cached[0] < _PRICE_CACHE_TTL:
+            return cached[1]
+
+        try:
+            async with self._semaphore_for(exchange):
+                price_data = await exchange_adapter.get_price(symbol)
+            if price_data is not None:
+                self._price_cache[(exchange, symbol)] = (time.monotonic(), price_data)
+            return price_data
+        except Exception as e:
+            logger.error(f"Error getting price for {symbol} on {exchange}: {e}")
+            return None
+
+    async def get_prices_for_exchange(self, exchange: ExchangeType, symbols: Iterable[str]) -> List[PriceData]:
+        """
+        Get multiple prices from one exchange.
+
+        Принимает любой Iterable (включая dict-view вроде symbols.keys()),
+        чтобы вызывающие не делали лишнюю копию списка; символы
+        обходятся ровно один раз при разборе кеш-попаданий.
+        """
+        exchange_adapter = self.exchanges.get(exchange)
+        if not exchange_adapter:
+            logger.error(f"Exchange {exchange} not found in available exchanges")
+            return []
+
+        # Делим символы на свежие попадания в кеш и промахи:
+        # к бирже идем только за промахами
+        now = time.monotonic()
+        cache = self._price_cache
+        hits: List[PriceData] = []
+        misses: List[str] = []
+        for symbol in symbols:
+            cached = cache.get((exchange, symbol))
+            if cached is not None and now - cached[0] < _PRICE_CACHE_TTL:
+                hits.append(cached[1])
+            else:
+                misses.append(symbol)
+
+        if not misses:
+            return hits
+
+        try:
+            async with self._semaphore_for(exchange):
+                fetched = await exchange_adapter.get_multiple_prices(misses)
+        except Exception as e:
+            logger.error(f"Error getting prices from {exchange}: {e}")
+            return hits
+
+        now = time.monotonic()
+        for price_data in fetched:
+            cache[(exchange, price_data.symbol)] = (now, price_data)
+        return hits + fetched
+
+    async def get_all_prices(self, symbols_by_exchange: Dict[ExchangeType, Iterable[str]]) -> List[PriceData]:
+        """
+        Опрашивает все биржи параллельно через asyncio.gather.
+
+        Задержки бирж перекрываются: общее время равно самой медленной
+        бирже, а не сумме всех round-trip'ов.
+        """
+        tasks = [
+            self.get_prices_for_exchange(exchange, symbols)
+            for exchange, symbols in symbols_by_exchange.items()
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        prices: List[PriceData] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching prices: {result}")
+            else:
+                prices.extend(result)
+        return prices
@@ -5,7 +5,17 @@ from models.alert import AlertTarget
 
 class StorageBase(ABC):
     """Base storage interface"""
-    
+
+    @property
+    def version(self) -> int:
+        """
+        Monotonic counter incremented on every mutation.
+
+        Callers may cache derived data and reload only when this changes.
+        """
+        return getattr(self, '_version', 0)
+
+
     @abstractmethod
     async def load_alerts(self) -> List[AlertTarget]:
         """Load all alerts"""
@@ -30,3 +40,21 @@ class StorageBase(ABC):
     async def get_user_data(self, user_id: str) -> Dict[str, Any]:
         """Get user data by ID"""
         pass
+
+    @abstractmethod
+    async def get_all_user_data(self) -> Dict[str, Dict[str, Any]]:
+        """Get data for all users as {user_id: user_data}"""
+        pass
+
+    async def load_active_alerts(self) -> List[AlertTarget]:
+        """Load only alerts that can trigger (backends may override to pre-filter)"""
+        return [alert for alert in await self.load_alerts() if alert.can_trigger()]
+
+    async def bulk_update_alerts(self, alerts: List[AlertTarget]) -> None:
+        """Update many alerts at once (backends may override to batch I/O)"""
+        for alert in alerts:
+            await self.update_alert(alert)
+
+    async def flush(self):
+        """Persist any buffered changes (no-op for write-through backends)"""
+        pass
@@ -2,77 +2,264 @@
 Реализация хранилища, использующая локальный JSON-файл.
 Идеально для тестирования и разработки.
 """
+import asyncio
 import json
 import logging
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 import uuid
 
+# orjson (Rust) парсит и сериализует в разы быстрее stdlib json и
+# нативно понимает datetime/enum; stdlib остается запасным вариантом
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from models.alert import AlertTarget
 from storage.base import StorageBase
 
 logger = logging.getLogger(__name__)
 
+# Задержка отложенной записи: несколько подряд идущих мутаций
+# (например, пачка update_alert после цикла проверки) схлопываются
+# в одну запись файла
+_FLUSH_DELAY_SECONDS = 1.0
+
+
 class JSONStorage(StorageBase):
     def __init__(self, file_path: str):
         self.file_path = Path(file_path)
         self._ensure_file_exists()
+        # Файл читается один раз, дальше все операции работают с кешем;
+        # на диск пишем отложенно и только при изменениях
+        self._cache: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Защищает кеш от гонок между циклом проверки и bot-handlers
+        self._lock = asyncio.Lock()
+        # Ранний будильник для отложенной записи: flush() ставит его,
+        # чтобы не пересиживать остаток дебаунс-паузы
+        self._flush_wakeup = asyncio.Event()
+        # Счетчик мутаций: потребители (AlertManager) перечитывают
+        # алерты только когда он изменился
+        self._version = 0
 
     def _ensure_file_exists(self):
         """Создает пустой файл-хранилище, если его нет."""
         if not self.file_path.exists():
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
             with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump({"alerts": [], "users": {}}, f, indent=4)
+                json.dump({"alerts": {}, "users": {}}, f, indent=4)
             logger.info(f"Created empty storage file at {self.file_path}")
 
-    def _read_data(self) -> Dict[str, Any]:
-        """Читает все данные из файла."""
+    def _read_file(self) -> Dict[str, Any]:
+        """Блокирующее чтение файла (вызывается из executor-потока)."""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            if orjson is not None:
+                data = orjson.loads(raw)
+            else:
+                data = json.loads(raw)
+            return self._migrate_layout(data)
+        except (ValueError, FileNotFoundError):
             logger.error(f"Could not read or parse {self.file_path}. Recreating it.")
             self._ensure_file_exists()
-            return {"alerts": [], "users": {}}
+            return {"alerts": {}, "users": {}}
+
+    @staticmethod
+    def _migrate_layout(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Мигрирует старую раскладку {"alerts": [...]} в id-keyed dict.
+
+        Dict по id дает O(1) update/delete вместо линейного поиска
+        по списку на каждую операцию.
+        """
+        alerts = data.get("alerts")
+        if isinstance(alerts, list):
+            migrated = {}
+            for alert_data in alerts:
+                alert_id = alert_data.get("id") or str(uuid.uuid4())
+                alert_data["id"] = alert_id
+                migrated[alert_id] = alert_data
+            data["alerts"] = migrated
+            logger.info(f"Migrated {len(migrated)} alerts to id-keyed storage layout")
+        elif alerts is None:
+            data["alerts"] = {}
+        return data
+
+    def _write_payload(self, payload: bytes):
+        """
+        Блокирующая запись готовых байт (вызывается из executor-потока).
+
+        Пишем во временный файл и атомарно подменяем os.replace:
+        упавший посреди записи процесс не оставит обрезанный JSON,
+        который _read_file иначе "восстановил" бы пустым хранилищем,
+        потеряв все алерты.
+        """
+        tmp_path = self.file_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+
+    async def _ensure_cache(self) -> Dict[str, Any]:
+        """
+        Загружает файл в кеш при первом обращении (в thread-executor,
+        чтобы не блокировать event loop на диске и json.load).
+        Вызывать под self._lock.
+        """
+        if self._cache is None:
+            loop = asyncio.get_running_loop()
+            self._cache = await loop.run_in_executor(None, self._read_file)
+        return self._cache
+
+    async def _aread_data(self) -> Dict[str, Any]:
+        """Возвращает данные из кеша (для read-only путей)."""
+        if self._cache is None:
+            async with self._lock:
+                await self._ensure_cache()
+        return self._cache
+
+    def _mark_dirty(self):
+        """
+        Помечает кеш измененным и планирует отложенную запись.
+
+        Сама запись произойдет через _FLUSH_DELAY_SECONDS, так что серия
+        мутаций стоит одного прохода JSON-сериализации вместо N.
+        """
+        self._dirty = True
+        self._version += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        # Ждем либо конца дебаунс-паузы, либо раннего будильника от flush()
+        try:
+            await asyncio.wait_for(self._flush_wakeup.wait(), _FLUSH_DELAY_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._flush_wakeup.clear()
+        async with self._lock:
+            await self._flush_now()
 
-    def _write_data(self, data: Dict[str, Any]):
-        """Записывает все данные в файл."""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, default=str) # default=str для datetime
+    async def _flush_now(self):
+        """Сбрасывает кеш на диск, если были изменения. Вызывать под self._lock."""
+        if not self._dirty or self._cache is None:
+            return
+        # Сериализуем на event-loop-потоке под локом: executor получает
+        # неизменяемые байты, а не живой dict, который bot-handlers
+        # могли бы менять прямо во время dumps в другом потоке
+        if orjson is not None:
+            payload = orjson.dumps(
+                self._cache, option=orjson.OPT_INDENT_2, default=str
+            )
+        else:
+            payload = json.dumps(self._cache, indent=4, default=str).encode('utf-8')
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_payload, payload)
+        self._dirty = False
+
+    async def flush(self):
+        """
+        Принудительно сбрасывает несохраненные изменения на диск.
+
+        Вызывается после пачки update_alert в цикле проверки и на
+        shutdown - K мутаций стоят одной записи файла.
+        """
+        task = self._flush_task
+        if task is not None and not task.done():
+            # Будим дебаунс-задачу, чтобы не пересиживать остаток паузы,
+            # и дожидаемся ее, а не отменяем: отмена может прилететь, когда
+            # задача уже внутри записи, и ее executor-поток продолжил бы
+            # писать tmp-файл параллельно с нашим flush
+            self._flush_wakeup.set()
+            await task
+            self._flush_wakeup.clear()
+        async with self._lock:
+            await self._flush_now()
 
     async def load_alerts(self) -> List[AlertTarget]:
-        data = self._read_data()
-        return [AlertTarget.parse_obj(alert_data) for alert_data in data.get("alerts", [])]
+        data = await self._aread_data()
+        # pydantic v2: model_validate идет через Rust-ядро, на порядок
+        # быстрее v1-шного parse_obj на построчном горячем пути
+        return [AlertTarget.model_validate(alert_data) for alert_data in data["alerts"].values()]
+
+    async def load_active_alerts(self) -> List[AlertTarget]:
+        """
+        Возвращает только алерты, способные сработать.
+
+        Фильтр по active/max_triggers идет по сырым dict'ам до
+        валидации: неактивные (в steady state их большинство) вообще
+        не платят за построение pydantic-модели.
+        """
+        data = await self._aread_data()
+        validate = AlertTarget.model_validate
+        result = []
+        for alert_data in data["alerts"].values():
+            if not alert_data.get("active", True):
+                continue
+            max_triggers = alert_data.get("max_triggers")
+            if max_triggers is not None and alert_data.get("triggered_count", 0) >= max_triggers:
+                continue
+            result.append(validate(alert_data))
+        return result
+
+    # Все мутаторы держат self._lock на время изменения кеша: мутация из
+    # bot-handler не может совпасть с сериализацией кеша во flush
 
     async def save_alert(self, alert: AlertTarget) -> bool:
-        data = self._read_data()
-        alert.id = str(uuid.uuid4()) # Присваиваем уникальный ID
-        data["alerts"].append(alert.dict())
-        self._write_data(data)
+        async with self._lock:
+            data = await self._ensure_cache()
+            alert.id = str(uuid.uuid4()) # Присваиваем уникальный ID
+            data["alerts"][alert.id] = alert.model_dump()
+            self._mark_dirty()
         logger.info(f"Saved new alert with ID {alert.id}")
         return True
-    
+
     async def update_alert(self, alert_to_update: AlertTarget) -> bool:
-        data = self._read_data()
-        alerts = data.get("alerts", [])
-        for i, alert_data in enumerate(alerts):
-            if alert_data.get("id") == alert_to_update.id:
-                alerts[i] = alert_to_update.dict()
-                self._write_data(data)
+        async with self._lock:
+            data = await self._ensure_cache()
+            alerts = data["alerts"]
+            if alert_to_update.id in alerts:
+                alerts[alert_to_update.id] = alert_to_update.model_dump()
+                self._mark_dirty()
                 logger.info(f"Updated alert with ID {alert_to_update.id}")
                 return True
         logger.warning(f"Could not find alert with ID {alert_to_update.id} to update.")
         return False
-    
+
+    async def bulk_update_alerts(self, alerts_to_update: List[AlertTarget]) -> None:
+        """
+        Обновляет пачку алертов за один проход: K dict-присваиваний
+        и одна пометка dirty вместо K отдельных операций.
+        """
+        if not alerts_to_update:
+            return
+        async with self._lock:
+            data = await self._ensure_cache()
+            alerts = data["alerts"]
+            updated = 0
+            for alert in alerts_to_update:
+                if alert.id in alerts:
+                    alerts[alert.id] = alert.model_dump()
+                    updated += 1
+                else:
+                    logger.warning(f"Could not find alert with ID {alert.id} to update.")
+            if updated:
+                self._mark_dirty()
+        if updated:
+            logger.info(f"Bulk-updated {updated} alerts")
+
     async def delete_alert(self, alert_id: str) -> bool:
         """Delete alert by ID"""
-        data = self._read_data()
-        alerts = data.get("alerts", [])
-        for i, alert_data in enumerate(alerts):
-            if alert_data.get("id") == alert_id:
-                alerts.pop(i)
-                self._write_data(data)
+        async with self._lock:
+            data = await self._ensure_cache()
+            if data["alerts"].pop(alert_id, None) is not None:
+                self._mark_dirty()
                 logger.info(f"Deleted alert with ID {alert_id}")
                 return True
         logger.warning(f"Could not find alert with ID {alert_id} to delete.")
@@ -80,19 +267,25 @@ class JSONStorage(StorageBase):
         
     # --- Методы для работы с пользователями ---
     async def get_user_data(self, user_id: str) -> Dict[str, Any]:
-        data = self._read_data()
+        data = await self._aread_data()
         return data.get("users", {}).get(user_id, {})
 
+    async def get_all_user_data(self) -> Dict[str, Dict[str, Any]]:
+        """Возвращает данные всех пользователей одним чтением."""
+        data = await self._aread_data()
+        return data.get("users", {})
+
     async def save_user_data(self, user_id: str, chat_id: str, pushover_key: str = None):
-        data = self._read_data()
-        if "users" not in data:
-            data["users"] = {}
-        
-        user_data = data["users"].get(user_id, {})
-        user_data["chat_id"] = chat_id
-        if pushover_key:
-            user_data["pushover_key"] = pushover_key
-        
-        data["users"][user_id] = user_data
-        self._write_data(data)
+        async with self._lock:
+            data = await self._ensure_cache()
+            if "users" not in data:
+                data["users"] = {}
+
+            user_data = data["users"].get(user_id, {})
+            user_data["chat_id"] = chat_id
+            if pushover_key:
+                user_data["pushover_key"] = pushover_key
+
+            data["users"][user_id] = user_data
+            self._mark_dirty()
         logger.info(f"Saved data for user {user_id}")
@@ -0,0 +1,44 @@
+"""
+Общий aiohttp connection pool для HTTP-клиентов приложения.
+
+Каждая библиотека (ccxt, aiogram, ...) по умолчанию создает свой
+ClientSession со своим TCP/TLS-пулом - это лишние handshake'и на каждом
+cold start. Клиенты, которые умеют принимать готовую сессию, должны
+использовать get_shared_session().
+"""
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_connector = None
+_session = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Возвращает общий ClientSession (создается лениво, один на процесс).
+
+    Должен вызываться внутри работающего event loop.
+    """
+    global _connector, _session
+    if _session is None or _session.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        _session = aiohttp.ClientSession(connector=_connector)
+        logger.debug("Shared aiohttp session created")
+    return _session
+
+
+async def close_shared_session():
+    """Закрывает общую сессию (на shutdown приложения)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.debug("Shared aiohttp session closed")
+    _session = None